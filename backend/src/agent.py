@@ -1,12 +1,19 @@
+import asyncio
 import json
 import logging
-from datetime import datetime
+import os
+import re
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Annotated, Optional
 
 from dotenv import load_dotenv
+from livekit import rtc
 from livekit.agents import (
     Agent,
     AgentSession,
+    ChatContext,
     JobContext,
     JobProcess,
     MetricsCollectedEvent,
@@ -14,192 +21,323 @@ from livekit.agents import (
     WorkerOptions,
     cli,
     function_tool,
+    llm,
     metrics,
     tokenize,
     RunContext,
 )
-from livekit.plugins import murf, silero, google, deepgram, noise_cancellation
-from livekit.plugins.turn_detector.multilingual import MultilingualModel
+from livekit.plugins import murf, silero, google, deepgram, noise_cancellation, openai
+from openai.types.realtime.realtime_audio_input_turn_detection import ServerVad
+from pydantic import Field
 
 logger = logging.getLogger("agent")
 
 load_dotenv(".env.local")
 
-# Directory to save orders (relative to backend directory)
+# Use a single realtime speech-to-speech model instead of the STT -> LLM -> TTS pipeline
+USE_REALTIME = os.getenv("USE_REALTIME", "").lower() in ("1", "true", "yes")
+
+# How LLM text is chunked before it is sent to Murf: "token" streams words as they
+# arrive for the lowest time-to-first-audio, "sentence" waits for full sentences
+# for more natural prosody
+TTS_STREAM_MODE = os.getenv("TTS_STREAM_MODE", "token").lower()
+if TTS_STREAM_MODE not in ("token", "sentence"):
+    raise ValueError(
+        f"TTS_STREAM_MODE must be 'token' or 'sentence', got {TTS_STREAM_MODE!r}"
+    )
+
+# OpenAI-compatible endpoint of a locally served model (e.g. llama.cpp's `llama-server`).
+# When set, the pipeline uses it first and falls back to Gemini if it fails.
+LOCAL_LLM_URL = os.getenv("LOCAL_LLM_URL")
+LOCAL_LLM_MODEL = os.getenv("LOCAL_LLM_MODEL", "llama-3.2-3b-instruct-q4_k_m")
+
+# The barista only speaks English, so the smaller English-only turn detector is the default.
+# Set TURN_DETECTOR=multilingual for other languages. Only the selected model is imported,
+# since importing a turn detector registers its model with the worker's inference process.
+TURN_DETECTOR = os.getenv("TURN_DETECTOR", "english").lower()
+if TURN_DETECTOR == "multilingual":
+    from livekit.plugins.turn_detector.multilingual import (
+        MultilingualModel as TurnDetector,
+    )
+elif TURN_DETECTOR == "english":
+    from livekit.plugins.turn_detector.english import EnglishModel as TurnDetector
+else:
+    raise ValueError(
+        f"TURN_DETECTOR must be 'english' or 'multilingual', got {TURN_DETECTOR!r}"
+    )
+
+# Directory to save orders (relative to backend directory). Orders go into one
+# subdirectory per day so no single directory grows without bound.
 ORDERS_DIR = Path(__file__).parent.parent / "orders"
 ORDERS_DIR.mkdir(exist_ok=True)
 
+# Last day directory created, so the mkdir only happens once per day
+_last_order_dir: Optional[Path] = None
+
+# Anything outside this set would be unsafe or awkward in an order filename (e.g. "/" or ":")
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9_-]+")
+
+# Bits for the order fields, set in `Barista._filled` as each one is provided. Extras may
+# be empty, but the customer still has to be asked, so `_EXTRAS` is set either by adding
+# extras or by an explicit `no_extras`.
+_DRINK, _SIZE, _MILK, _EXTRAS, _NAME = 1, 2, 4, 8, 16
+_REQUIRED = _DRINK | _SIZE | _MILK | _EXTRAS | _NAME
+
+# (bit, label for the order status, question to ask when it's missing), in the order they are asked
+_REQUIRED_FIELDS = (
+    (
+        _DRINK,
+        "drink type",
+        "I still need to know what drink you'd like. What can I get for you?",
+    ),
+    (_SIZE, "size", "What size would you like for your drink?"),
+    (_MILK, "milk type", "What type of milk would you like?"),
+    (
+        _EXTRAS,
+        "extras (or none)",
+        "Would you like any extras like whipped cream, caramel, or an extra shot?",
+    ),
+    (_NAME, "name", "What name should I put on the order?"),
+)
+
+
+@dataclass
+class Order:
+    drink_type: str = ""
+    size: str = ""
+    milk: str = ""
+    extras: set[str] = field(default_factory=set)
+    name: str = ""
+
+    def to_dict(self) -> dict:
+        """The saved order, in the order schema from the Day 2 task."""
+        return {
+            "drinkType": self.drink_type,
+            "size": self.size,
+            "milk": self.milk,
+            # Sets aren't JSON serializable; sorting also keeps the saved file stable
+            "extras": sorted(self.extras),
+            "name": self.name,
+        }
+
+
+def _write_order(filepath: Path, order: dict) -> None:
+    """Write an order to disk. Blocking, so call it through `asyncio.to_thread`."""
+    global _last_order_dir
+    if filepath.parent != _last_order_dir:
+        filepath.parent.mkdir(exist_ok=True)
+        _last_order_dir = filepath.parent
+    # json.dumps runs the C encoder over the whole order and hands back one string, so it
+    # lands in a single write; json.dump would iterate in Python and write chunk by chunk
+    data = json.dumps(order, separators=(",", ":"))
+    try:
+        filepath.write_text(data)
+    except FileNotFoundError:
+        # The cached directory was removed (e.g. orders cleaned up) since it was created
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        filepath.write_text(data)
+
 
 class Barista(Agent):
     def __init__(self) -> None:
         # Initialize order state
-        self.order = {
-            "drinkType": "",
-            "size": "",
-            "milk": "",
-            "extras": [],
-            "name": "",
-        }
+        self.order = Order()
+        self._filled = 0
         
         super().__init__(
-            instructions="""You are a friendly and enthusiastic barista at a coffee shop. 
-            Your job is to take voice orders from customers in a warm, welcoming manner.
-            
-            When a customer approaches, greet them warmly and ask what they'd like to order.
-            You need to collect the following information for each order:
-            - drinkType: The type of drink (e.g., latte, cappuccino, americano, espresso, mocha, frappuccino, etc.)
-            - size: The size of the drink (small, medium, large, or tall, grande, venti)
-            - milk: The type of milk (whole, skim, almond, oat, soy, coconut, or none)
-            - extras: Any additional items (e.g., whipped cream, caramel, vanilla, chocolate, extra shot, etc.) - this can be an empty list if the customer doesn't want any extras
-            - name: The customer's name for the order
-            
-            IMPORTANT: Use the function tools to update the order state as the customer provides information:
-            - Call set_drink_type when the customer mentions what drink they want
-            - Call set_size when the customer mentions the size
-            - Call set_milk when the customer mentions milk preference
-            - Call add_extra for each extra item the customer wants (can be called multiple times)
-            - Call set_name when the customer provides their name
-            
-            Ask clarifying questions one at a time until you have all the information.
-            Be conversational and friendly. If a customer mentions multiple things at once, acknowledge them and use the appropriate tools to capture each detail.
-            
-            Once you have collected drinkType, size, milk, and name (extras can be empty), you MUST call the complete_order tool to finalize and save the order.
-            Do not wait for the customer to explicitly say "that's all" - once you have all required fields, automatically complete the order.
-            
-            Your responses should be natural, friendly, and concise. Speak as if you're having a real conversation with a customer.""",
+            # Kept short and static: it is resent on every turn, and an unchanged prefix
+            # lets the provider reuse its prompt cache. Field examples live in the update_order
+            # parameter descriptions, which are part of the tool schema.
+            instructions="""You are a friendly barista at a coffee shop taking voice orders.
+- Greet the customer and take their order, asking for one missing detail at a time.
+- An order has a drink type, size, milk, extras, and the customer's name. Always offer extras; pass no_extras=true if they want none.
+- Call update_order with every field you can infer from what the customer said, in one call. "A large oat latte for Alice" sets drink_type, size, milk and name. Only pass new extras.
+- As soon as update_order reports the order complete, call complete_order. Do not wait for "that's all".
+- Keep replies short, warm and conversational.""",
         )
 
     @function_tool
-    async def set_drink_type(self, context: RunContext, drink_type: str) -> str:
-        """Set the type of drink the customer wants to order.
-        
-        Args:
-            drink_type: The type of drink (e.g., latte, cappuccino, americano, espresso, mocha, frappuccino, etc.)
-        """
-        self.order["drinkType"] = drink_type
-        logger.info(f"Drink type set to: {drink_type}")
-        return f"Got it, a {drink_type}. What size would you like?"
-
-    @function_tool
-    async def set_size(self, context: RunContext, size: str) -> str:
-        """Set the size of the drink.
-        
-        Args:
-            size: The size (small, medium, large, or tall, grande, venti)
-        """
-        self.order["size"] = size
-        logger.info(f"Size set to: {size}")
-        return f"Perfect, a {size} size. What type of milk would you like?"
-
-    @function_tool
-    async def set_milk(self, context: RunContext, milk_type: str) -> str:
-        """Set the type of milk for the drink.
-        
-        Args:
-            milk_type: The type of milk (whole, skim, almond, oat, soy, coconut, or none)
-        """
-        self.order["milk"] = milk_type
-        logger.info(f"Milk type set to: {milk_type}")
-        if not self.order["extras"]:
-            return f"Great, {milk_type} milk. Would you like any extras like whipped cream, caramel, or an extra shot?"
-        else:
-            return f"Perfect, {milk_type} milk. And what name should I put on the order?"
-
-    @function_tool
-    async def add_extra(self, context: RunContext, extra: str) -> str:
-        """Add an extra item to the order.
-        
-        Args:
-            extra: The extra item (e.g., whipped cream, caramel, vanilla, chocolate, extra shot, etc.)
+    async def update_order(
+        self,
+        context: RunContext,
+        # Descriptions go through `Field` because docstring `Args:` don't reach the tool schema
+        drink_type: Annotated[
+            Optional[str],
+            Field(
+                description="The type of drink (e.g., latte, cappuccino, americano, "
+                "espresso, mocha, frappuccino, etc.)"
+            ),
+        ] = None,
+        size: Annotated[
+            Optional[str],
+            Field(
+                description="The size (small, medium, large, or tall, grande, venti)"
+            ),
+        ] = None,
+        milk: Annotated[
+            Optional[str],
+            Field(
+                description="The type of milk (whole, skim, almond, oat, soy, coconut, "
+                "or none)"
+            ),
+        ] = None,
+        extras: Annotated[
+            Optional[list[str]],
+            Field(
+                description="Extra items to add (e.g., whipped cream, caramel, "
+                "vanilla, chocolate, extra shot, etc.)"
+            ),
+        ] = None,
+        no_extras: Annotated[
+            bool,
+            Field(
+                description="True only once the customer has been offered extras and "
+                "said they don't want any"
+            ),
+        ] = False,
+        name: Annotated[Optional[str], Field(description="The customer's name")] = None,
+    ) -> str:
+        """Update the order with every detail the customer has given. Fill in all the fields
+        you can infer from what the customer said in one call and leave the others out.
         """
-        if extra not in self.order["extras"]:
-            self.order["extras"].append(extra)
-        logger.info(f"Extra added: {extra}. Current extras: {self.order['extras']}")
-        return f"Added {extra}. Anything else, or what name should I put on the order?"
+        changes = {}
+        if drink_type:
+            self.order.drink_type = changes["drink_type"] = drink_type
+            self._filled |= _DRINK
+        if size:
+            self.order.size = changes["size"] = size
+            self._filled |= _SIZE
+        if milk:
+            self.order.milk = changes["milk"] = milk
+            self._filled |= _MILK
+        # Every parameter is required in the tool schema, so the model sends an
+        # (often empty) `extras` on each call. Only actual extras or an explicit
+        # `no_extras` count as the customer having been asked.
+        if extras:
+            self.order.extras.update(extras)
+            changes["extras"] = extras
+            self._filled |= _EXTRAS
+        if no_extras:
+            changes["no_extras"] = True
+            self._filled |= _EXTRAS
+        if name:
+            self.order.name = changes["name"] = name
+            self._filled |= _NAME
+        logger.info("Order updated: %s. Current order: %s", changes, self.order)
 
-    @function_tool
-    async def set_name(self, context: RunContext, name: str) -> str:
-        """Set the customer's name for the order.
-        
-        Args:
-            name: The customer's name
-        """
-        self.order["name"] = name
-        logger.info(f"Name set to: {name}")
-        
-        # Check if order is complete
-        if self.order["drinkType"] and self.order["size"] and self.order["milk"]:
-            # All required fields are filled, suggest completing
-            return f"Thanks {name}! I have everything I need. Let me complete your order now."
-        else:
-            return f"Thanks {name}! I still need a few more details about your order."
+        status = self.get_order_status()
+        if status == "complete":
+            return "Got it! I have everything I need. Let me complete your order now."
+        return f"Got it. {status}. Ask the customer for the next missing detail."
 
     @function_tool
     async def complete_order(self, context: RunContext) -> str:
         """Complete the order by saving it to a JSON file. Only call this when all fields are filled:
-        drinkType, size, milk, extras (can be empty list), and name.
+        drink_type, size, milk, extras (can be empty once the customer has been asked), and name.
         
         This should be called automatically when all required information has been collected.
         """
         # Check if all required fields are filled
-        if not self.order["drinkType"]:
-            return "I still need to know what drink you'd like. What can I get for you?"
-        if not self.order["size"]:
-            return "What size would you like for your drink?"
-        if not self.order["milk"]:
-            return "What type of milk would you like?"
-        if not self.order["name"]:
-            return "What name should I put on the order?"
+        if self._filled & _REQUIRED != _REQUIRED:
+            return self._missing_message()
         
         # Save order to JSON file
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"order_{timestamp}_{self.order['name'].replace(' ', '_')}.json"
-        filepath = ORDERS_DIR / filename
+        now = time.localtime()
+        timestamp = time.strftime("%Y%m%d_%H%M%S", now)
+        safe_name = _UNSAFE_FILENAME_CHARS.sub("_", self.order.name)[:40]
+        filename = f"order_{timestamp}_{safe_name}.json"
+        filepath = ORDERS_DIR / time.strftime("%Y%m%d", now) / filename
         
-        with open(filepath, "w") as f:
-            json.dump(self.order, f, indent=2)
+        # Keep file I/O off the event loop so audio and TTS streaming don't stall
+        await asyncio.to_thread(_write_order, filepath, self.order.to_dict())
         
-        logger.info(f"Order saved to {filepath}")
+        logger.info("Order saved to %s", filepath)
         
         # Create a summary message
-        extras_str = ", ".join(self.order["extras"]) if self.order["extras"] else "no extras"
+        extras_str = ", ".join(sorted(self.order.extras)) if self.order.extras else "no extras"
         summary = (
-            f"Perfect! I've got your order: a {self.order['size']} {self.order['drinkType']} "
-            f"with {self.order['milk']} milk, {extras_str}. "
-            f"Your order has been saved. We'll call your name, {self.order['name']}, when it's ready!"
+            f"Perfect! I've got your order: a {self.order.size} {self.order.drink_type} "
+            f"with {self.order.milk} milk, {extras_str}. "
+            f"Your order has been saved. We'll call your name, {self.order.name}, when it's ready!"
         )
         
         # Reset order for next customer
-        self.order = {
-            "drinkType": "",
-            "size": "",
-            "milk": "",
-            "extras": [],
-            "name": "",
-        }
+        self.order = Order()
+        self._filled = 0
         
         return summary
 
+    def _missing_message(self) -> str:
+        """Question to ask for the first required field that hasn't been filled yet."""
+        for bit, _, question in _REQUIRED_FIELDS:
+            if not self._filled & bit:
+                return question
+        return ""
+
     def get_order_status(self) -> str:
         """Get the current status of the order to help determine what to ask next."""
-        missing = []
-        if not self.order["drinkType"]:
-            missing.append("drink type")
-        if not self.order["size"]:
-            missing.append("size")
-        if not self.order["milk"]:
-            missing.append("milk type")
-        if not self.order["name"]:
-            missing.append("name")
-        
-        if not missing:
+        if self._filled & _REQUIRED == _REQUIRED:
             return "complete"
+        missing = [label for bit, label, _ in _REQUIRED_FIELDS if not self._filled & bit]
         return f"Missing: {', '.join(missing)}"
 
 
+def _build_llm() -> llm.LLM:
+    gemini = google.LLM(model="gemini-2.5-flash")
+    if not LOCAL_LLM_URL:
+        return gemini
+
+    # Taking the order is a short, fixed-schema dialog, which a small quantized model
+    # served next to the worker handles without the WAN round-trip to a hosted model.
+    # Run the server with tool calling enabled so tool-call output is grammar-constrained
+    # to the tool schemas, e.g.:
+    #   llama-server -m Llama-3.2-3B-Instruct-Q4_K_M.gguf --jinja --port 8080
+    local = openai.LLM(base_url=LOCAL_LLM_URL, model=LOCAL_LLM_MODEL, api_key="no-key")
+    return llm.FallbackAdapter([local, gemini])
+
+
+def _build_tts() -> murf.TTS:
+    if TTS_STREAM_MODE == "sentence":
+        return murf.TTS(
+            voice="en-US-matthew",
+            style="Conversation",
+            tokenizer=tokenize.basic.SentenceTokenizer(min_sentence_len=2),
+            text_pacing=True,
+        )
+    # Barista replies are short, so waiting for punctuation before synthesis costs
+    # more latency than the slightly less natural prosody of word-level streaming
+    return murf.TTS(
+        voice="en-US-matthew",
+        style="Conversation",
+        tokenizer=tokenize.basic.WordTokenizer(ignore_punctuation=False),
+    )
+
+
+async def _warm_up_turn_detector(turn_detector: TurnDetector) -> None:
+    # The turn detector's ONNX session lives in the worker's shared inference process, which
+    # builds it once in `initialize()`, so only the first job on each worker pays for the
+    # first end-of-turn check. Running a throwaway prediction while the session starts
+    # keeps that cost off that job's first utterance; on later jobs it is a cheap no-op.
+    chat_ctx = ChatContext.empty()
+    chat_ctx.add_message(role="user", content="Hi, can I get a latte?")
+    try:
+        await turn_detector.predict_end_of_turn(chat_ctx)
+    except Exception:
+        logger.warning("Turn detector warm-up failed", exc_info=True)
+
+
 def prewarm(proc: JobProcess):
     proc.userdata["vad"] = silero.VAD.load()
 
+    if not USE_REALTIME:
+        # Job processes are started ahead of time and each runs a single job, so building
+        # the plugin clients here takes their setup off the job's startup path. Their
+        # connections are opened per job by `AgentSession.start()`, since they are bound
+        # to the job's event loop and HTTP session.
+        proc.userdata["stt"] = deepgram.STT(model="nova-3")
+        proc.userdata["llm"] = _build_llm()
+        proc.userdata["tts"] = _build_tts()
+
 
 async def entrypoint(ctx: JobContext):
     # Logging setup
@@ -208,42 +346,45 @@ async def entrypoint(ctx: JobContext):
         "room": ctx.room.name,
     }
 
-    # Set up a voice AI pipeline using OpenAI, Cartesia, AssemblyAI, and the LiveKit turn detector
-    session = AgentSession(
-        # Speech-to-text (STT) is your agent's ears, turning the user's speech into text that the LLM can understand
-        # See all available models at https://docs.livekit.io/agents/models/stt/
-        stt=deepgram.STT(model="nova-3"),
-        # A Large Language Model (LLM) is your agent's brain, processing user input and generating a response
-        # See all available models at https://docs.livekit.io/agents/models/llm/
-        llm=google.LLM(
-                model="gemini-2.5-flash",
-            ),
-        # Text-to-speech (TTS) is your agent's voice, turning the LLM's text into speech that the user can hear
-        # See all available models as well as voice selections at https://docs.livekit.io/agents/models/tts/
-        tts=murf.TTS(
-                voice="en-US-matthew", 
-                style="Conversation",
-                tokenizer=tokenize.basic.SentenceTokenizer(min_sentence_len=2),
-                text_pacing=True
+    turn_detector_warmup: Optional[asyncio.Task] = None
+
+    if USE_REALTIME:
+        # A realtime model takes speech in and produces speech out in a single stream,
+        # which removes the STT and TTS round-trips from every turn. Turn detection runs
+        # server-side, so no local VAD or turn detector is needed. Do not enable
+        # `preemptive_generation` here: the model already starts responding as soon as
+        # the server VAD detects the end of the turn, and enabling it causes double generation.
+        # (Note: This is for the OpenAI Realtime API. For other providers, see https://docs.livekit.io/agents/models/realtime/)
+        # Set OPENAI_API_KEY and USE_REALTIME=1 in .env.local to use it.
+        session = AgentSession(
+            llm=openai.realtime.RealtimeModel(
+                voice="marin",
+                turn_detection=ServerVad(type="server_vad"),
             ),
-        # VAD and turn detection are used to determine when the user is speaking and when the agent should respond
-        # See more at https://docs.livekit.io/agents/build/turns
-        turn_detection=MultilingualModel(),
-        vad=ctx.proc.userdata["vad"],
-        # allow the LLM to generate a response while waiting for the end of turn
-        # See more at https://docs.livekit.io/agents/build/audio/#preemptive-generation
-        preemptive_generation=True,
-    )
+        )
+    else:
+        turn_detector = TurnDetector()
+        turn_detector_warmup = asyncio.create_task(_warm_up_turn_detector(turn_detector))
 
-    # To use a realtime model instead of a voice pipeline, use the following session setup instead.
-    # (Note: This is for the OpenAI Realtime API. For other providers, see https://docs.livekit.io/agents/models/realtime/))
-    # 1. Install livekit-agents[openai]
-    # 2. Set OPENAI_API_KEY in .env.local
-    # 3. Add `from livekit.plugins import openai` to the top of this file
-    # 4. Use the following session setup instead of the version above
-    # session = AgentSession(
-    #     llm=openai.realtime.RealtimeModel(voice="marin")
-    # )
+        # Set up a voice AI pipeline using Deepgram, Gemini, Murf, and the LiveKit turn detector
+        session = AgentSession(
+            # Speech-to-text (STT) is your agent's ears, turning the user's speech into text that the LLM can understand
+            # See all available models at https://docs.livekit.io/agents/models/stt/
+            stt=ctx.proc.userdata["stt"],
+            # A Large Language Model (LLM) is your agent's brain, processing user input and generating a response
+            # See all available models at https://docs.livekit.io/agents/models/llm/
+            llm=ctx.proc.userdata["llm"],
+            # Text-to-speech (TTS) is your agent's voice, turning the LLM's text into speech that the user can hear
+            # See all available models as well as voice selections at https://docs.livekit.io/agents/models/tts/
+            tts=ctx.proc.userdata["tts"],
+            # VAD and turn detection are used to determine when the user is speaking and when the agent should respond
+            # See more at https://docs.livekit.io/agents/build/turns
+            turn_detection=turn_detector,
+            vad=ctx.proc.userdata["vad"],
+            # allow the LLM to generate a response while waiting for the end of turn
+            # See more at https://docs.livekit.io/agents/build/audio/#preemptive-generation
+            preemptive_generation=True,
+        )
 
     # Metrics collection, to measure pipeline performance
     # For more information, see https://docs.livekit.io/agents/build/metrics/
@@ -256,7 +397,7 @@ async def entrypoint(ctx: JobContext):
 
     async def log_usage():
         summary = usage_collector.get_summary()
-        logger.info(f"Usage: {summary}")
+        logger.info("Usage: %s", summary)
 
     ctx.add_shutdown_callback(log_usage)
 
@@ -269,18 +410,27 @@ async def entrypoint(ctx: JobContext):
     # await avatar.start(session, room=ctx.room)
 
     # Start the session, which initializes the voice pipeline and warms up the models
+    # (this also opens the STT and Murf TTS connections, so the first reply doesn't pay the handshake)
     await session.start(
         agent=Barista(),
         room=ctx.room,
         room_input_options=RoomInputOptions(
-            # For telephony applications, use `BVCTelephony` for best results
-            noise_cancellation=noise_cancellation.BVC(),
+            # Picked per participant: SIP callers send narrowband phone audio, which the smaller
+            # `BVCTelephony` model is tuned for; everyone else gets the general `BVC` model
+            noise_cancellation=lambda params: (
+                noise_cancellation.BVCTelephony()
+                if params.participant.kind == rtc.ParticipantKind.PARTICIPANT_KIND_SIP
+                else noise_cancellation.BVC()
+            ),
         ),
     )
 
     # Join the room and connect to the user
     await ctx.connect()
 
+    if turn_detector_warmup is not None:
+        await turn_detector_warmup
+
 
 if __name__ == "__main__":
     cli.run_app(WorkerOptions(entrypoint_fnc=entrypoint, prewarm_fnc=prewarm))
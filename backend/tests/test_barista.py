@@ -0,0 +1,157 @@
+import json
+import shutil
+
+import pytest
+
+import agent
+from agent import Barista
+
+
+@pytest.fixture
+def orders_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(agent, "ORDERS_DIR", tmp_path)
+    monkeypatch.setattr(agent, "_last_order_dir", None)
+    return tmp_path
+
+
+@pytest.mark.asyncio
+async def test_update_order_fills_only_given_fields() -> None:
+    """Partial updates leave the other fields alone and report what is still missing."""
+    barista = Barista()
+
+    result = await barista.update_order(None, drink_type="latte", size="large")
+
+    assert barista.order.drink_type == "latte"
+    assert barista.order.size == "large"
+    assert barista.order.milk == ""
+    assert barista.order.name == ""
+    assert result == (
+        "Got it. Missing: milk type, extras (or none), name. "
+        "Ask the customer for the next missing detail."
+    )
+
+
+@pytest.mark.asyncio
+async def test_update_order_dedups_extras() -> None:
+    """Extras are merged across calls without duplicates."""
+    barista = Barista()
+
+    await barista.update_order(None, extras=["caramel", "caramel"])
+    await barista.update_order(None, extras=["caramel", "extra shot"])
+
+    assert barista.order.extras == {"caramel", "extra shot"}
+
+
+@pytest.mark.asyncio
+async def test_extras_must_be_offered_before_complete() -> None:
+    """The order isn't complete until the customer has been asked about extras."""
+    barista = Barista()
+
+    result = await barista.update_order(
+        None, drink_type="latte", size="large", milk="oat", name="Alice"
+    )
+    assert "extras (or none)" in result
+    assert barista.get_order_status() == "Missing: extras (or none)"
+
+    result = await barista.update_order(None, no_extras=True)
+    assert result == "Got it! I have everything I need. Let me complete your order now."
+    assert barista.get_order_status() == "complete"
+
+
+@pytest.mark.asyncio
+async def test_empty_extras_does_not_count_as_declined() -> None:
+    """The model sends every parameter, so an empty extras list must not complete the order."""
+    barista = Barista()
+
+    result = await barista.update_order(
+        None,
+        drink_type="latte",
+        size="large",
+        milk="oat",
+        extras=[],
+        no_extras=False,
+        name="Alice",
+    )
+
+    assert "extras (or none)" in result
+    assert barista.get_order_status() == "Missing: extras (or none)"
+
+
+@pytest.mark.asyncio
+async def test_complete_order_asks_for_first_missing_field(orders_dir) -> None:
+    """complete_order asks for the first missing field and doesn't save anything."""
+    barista = Barista()
+
+    assert await barista.complete_order(None) == (
+        "I still need to know what drink you'd like. What can I get for you?"
+    )
+
+    await barista.update_order(None, drink_type="mocha", size="small")
+    assert await barista.complete_order(None) == "What type of milk would you like?"
+
+    await barista.update_order(None, milk="none")
+    assert await barista.complete_order(None) == (
+        "Would you like any extras like whipped cream, caramel, or an extra shot?"
+    )
+
+    await barista.update_order(None, extras=["whipped cream"])
+    assert await barista.complete_order(None) == "What name should I put on the order?"
+
+    assert list(orders_dir.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_complete_order_saves_and_resets(orders_dir) -> None:
+    """A completed order is saved under a per-day directory with a sanitized name."""
+    barista = Barista()
+    await barista.update_order(
+        None,
+        drink_type="latte",
+        size="large",
+        milk="oat",
+        extras=["vanilla", "caramel"],
+        name="Al/B: Zoë",
+    )
+
+    summary = await barista.complete_order(None)
+
+    assert summary.startswith(
+        "Perfect! I've got your order: a large latte with oat milk"
+    )
+    files = list(orders_dir.glob("*/*.json"))
+    assert len(files) == 1
+    # The day directory matches the timestamp in the filename
+    assert files[0].name.startswith(f"order_{files[0].parent.name}_")
+    assert files[0].name.endswith("_Al_B_Zo_.json")
+    assert json.loads(files[0].read_text()) == {
+        "drinkType": "latte",
+        "size": "large",
+        "milk": "oat",
+        "extras": ["caramel", "vanilla"],
+        "name": "Al/B: Zoë",
+    }
+
+    # State is reset for the next customer
+    assert barista.order == agent.Order()
+    assert barista.get_order_status() == (
+        "Missing: drink type, size, milk type, extras (or none), name"
+    )
+
+
+@pytest.mark.asyncio
+async def test_complete_order_recreates_removed_day_dir(orders_dir) -> None:
+    """An order is still saved if the cached day directory was deleted in between."""
+    barista = Barista()
+    order = dict(
+        drink_type="latte", size="large", milk="oat", no_extras=True, name="Alice"
+    )
+
+    await barista.update_order(None, **order)
+    await barista.complete_order(None)
+    (day_dir,) = orders_dir.iterdir()
+    shutil.rmtree(day_dir)
+
+    await barista.update_order(None, **order)
+    await barista.complete_order(None)
+
+    assert len(list(orders_dir.glob("*/*.json"))) == 1